@@ -1,6 +1,9 @@
 import os
 from functools import partial
+import numpy as np
 import pandas as pd
+from safetensors.torch import save_file, load_file
+from scipy.sparse import coo_matrix
 import torch
 from torch_geometric.data import Data, InMemoryDataset, download_url
 from torch_geometric.datasets import Planetoid
@@ -26,7 +29,8 @@ class KarateClub(InMemoryDataset):
         assert self.name in self.available_datasets
 
         super().__init__(root, transform, pre_transform)
-        self.data, self.slices = torch.load(self.processed_paths[0])
+        data = Data(**load_file(self.processed_paths[0]))
+        self.data, self.slices = self.collate([data])
 
     @property
     def raw_dir(self):
@@ -42,7 +46,7 @@ class KarateClub(InMemoryDataset):
 
     @property
     def processed_file_names(self):
-        return 'data.pt'
+        return 'data.safetensors'
 
     def download(self):
         for part in ['edges', 'features', 'target']:
@@ -50,27 +54,38 @@ class KarateClub(InMemoryDataset):
 
     def process(self):
         target_file = os.path.join(self.raw_dir, self.raw_file_names[2])
-        y = pd.read_csv(target_file)['target']
+        y = pd.read_csv(target_file, engine='pyarrow')['target']
         y = torch.from_numpy(y.to_numpy(dtype=int))
         num_nodes = len(y)
 
         edge_file = os.path.join(self.raw_dir, self.raw_file_names[0])
-        edge_index = pd.read_csv(edge_file)
-        edge_index = torch.from_numpy(edge_index.to_numpy()).t().contiguous()
+        edge_index = pd.read_csv(edge_file, engine='pyarrow').to_numpy(np.int64)
+        edge_index = torch.from_numpy(np.ascontiguousarray(edge_index.T))
         edge_index = to_undirected(edge_index, num_nodes)  # undirected edges
 
         feature_file = os.path.join(self.raw_dir, self.raw_file_names[1])
-        x = pd.read_csv(feature_file).drop_duplicates()
-        x = x.pivot(index='node_id', columns='feature_id', values='value').fillna(0)
-        x = x.reindex(range(num_nodes), fill_value=0)
-        x = torch.from_numpy(x.to_numpy()).float()
+        dtype = {'node_id': np.int64, 'feature_id': np.int64, 'value': np.float32}
+        x = pd.read_csv(feature_file, engine='pyarrow', dtype=dtype)
+        node_id, feature_id, value = x['node_id'].to_numpy(), x['feature_id'].to_numpy(), x['value'].to_numpy()
+        _, first = np.unique(np.stack([node_id, feature_id], axis=1), axis=0, return_index=True)  # drop duplicates
+        feature_ids, feature_id = np.unique(feature_id[first], return_inverse=True)  # keep only observed features
+        x = coo_matrix((value[first], (node_id[first], feature_id)), shape=(num_nodes, len(feature_ids)))
+        x = torch.from_numpy(x.toarray())
 
         data = Data(x=x, edge_index=edge_index, y=y, num_nodes=num_nodes)
 
         if self.pre_transform is not None:
             data = self.pre_transform(data)
 
-        torch.save(self.collate([data]), self.processed_paths[0])
+        # single graph: store raw tensors and collate on load (num_nodes is inferred from x)
+        tensors = {}
+        for key, item in data:
+            if torch.is_tensor(item):
+                tensors[key] = item.contiguous()
+            elif key != 'num_nodes':
+                raise ValueError(f"cannot store non-tensor attribute '{key}' of the processed graph")
+
+        save_file(tensors, self.processed_paths[0])
 
     def __repr__(self):
         return f'KarateClub-{self.name}()'
@@ -101,4 +116,8 @@ def load_dataset(
         low, high = data_range
         data = Normalize(low, high)(data)
 
+    # derived from the final masks: index tensors allow cheaper gathers than boolean masks in every training step
+    for split in ['train', 'val', 'test']:
+        data[f'{split}_idx'] = data[f'{split}_mask'].nonzero(as_tuple=False).view(-1)
+
     return data
@@ -1,3 +1,4 @@
+import copy
 import os
 import sys
 import traceback
@@ -40,14 +41,26 @@ def confidence_interval(data, func=np.mean, size=1000, ci=95, seed=12345):
 def run(args):
     dataset = from_args(load_dataset, args)
 
+    # deterministic feature transforms are applied once, so all repeats share the same feature tensor
+    feature_transform = from_args(FeatureTransform, args)
+    if feature_transform.deterministic:
+        dataset = feature_transform(dataset)
+
+    # the graph is moved to the device once and shallow-copied for each run, as the transforms below do not modify
+    # tensors in-place
+    dataset = dataset.to(args.device)
+
     test_acc = []
     run_metrics = {}
     run_id = str(uuid.uuid1())
+    propagated_x = None
 
     logger = None
     if args.log and args.log_mode == LogMode.COLLECTIVE:
         logger = WandbLogger(project=args.project_name, config=args, enabled=args.log, reinit=False, group=run_id)
 
+    trainer = from_args(Trainer, args)  # shared across runs, only the logger changes
+
     progbar = tqdm(range(args.repeats), file=sys.stdout)
     for version in progbar:
 
@@ -56,22 +69,28 @@ def run(args):
             logger = WandbLogger(project=args.project_name, config=args, enabled=args.log, group=run_id)
 
         try:
-            data = dataset.clone().to(args.device)
+            data = copy.copy(dataset)
 
             # preprocess data
+            feature_perturbation = from_args(FeaturePerturbation, args)
             data = Compose([
-                from_args(FeatureTransform, args),
-                from_args(FeaturePerturbation, args),
+                feature_transform if not feature_transform.deterministic else lambda d: d,
+                feature_perturbation,
                 from_args(LabelPerturbation, args)
             ])(data)
 
             # define model
-            model = from_args(NodeClassifier, args, input_dim=data.num_features, num_classes=data.num_classes)
+            model = from_args(NodeClassifier, args, input_dim=data.num_features, num_classes=data.num_classes,
+                              propagated_x=propagated_x)
 
             # train the model
-            trainer = from_args(Trainer, args, logger=logger if args.log_mode == LogMode.INDIVIDUAL else None)
+            trainer.logger = logger if args.log_mode == LogMode.INDIVIDUAL else None
             best_metrics = trainer.fit(model, data)
 
+            # propagated features are identical across runs if no randomness is involved in feature preprocessing
+            if feature_transform.deterministic and feature_perturbation.deterministic:
+                propagated_x = model.propagated_x
+
             # process results
             for metric, value in best_metrics.items():
                 run_metrics[metric] = run_metrics.get(metric, []) + [value]
@@ -8,14 +8,15 @@ from torch_sparse import matmul
 
 
 class KProp(MessagePassing):
-    def __init__(self, steps, aggregator, add_self_loops, normalize, cached, transform=lambda x: x):
+    def __init__(self, steps, aggregator, add_self_loops, normalize, cached, transform=lambda x: x, cached_x=None):
         super().__init__(aggr=aggregator)
         self.transform = transform
         self.K = steps
         self.add_self_loops = add_self_loops
         self.normalize = normalize
         self.cached = cached
-        self._cached_x = None
+        self._cached_x = cached_x if cached else None
+        self._cached_adj_t = None
 
     def forward(self, x, adj_t):
         if self._cached_x is None or not self.cached:
@@ -27,18 +28,35 @@ class KProp(MessagePassing):
         if self.K <= 0:
             return x
 
-        if self.normalize:
-            adj_t = gcn_norm(adj_t, add_self_loops=False)
-
-        if self.add_self_loops:
-            adj_t = adj_t.set_diag()
+        adj_t = self.preprocess_adj(adj_t)
 
+        # adj_t is a SparseTensor, so propagation reduces to a plain SpMM per step;
+        # skip propagate() and its per-call argument inspection and hooks
         for k in range(self.K):
-            x = self.propagate(adj_t, x=x)
+            x = self.message_and_aggregate(adj_t, x)
 
         x = self.transform(x)
         return x
 
+    def preprocess_adj(self, adj_t):
+        if self._cached_adj_t is not None and self._cached_adj_t[0] is adj_t:
+            return self._cached_adj_t[1]
+
+        adj = adj_t
+
+        if self.normalize:
+            adj = gcn_norm(adj, add_self_loops=False)
+
+        if self.add_self_loops:
+            adj = adj.set_diag()
+
+        # the graph is static, so layers propagating on every call keep the normalized adjacency for later calls;
+        # cached layers propagate only once, so there is nothing to reuse
+        if not self.cached:
+            self._cached_adj_t = adj_t, adj
+
+        return adj
+
     def message_and_aggregate(self, adj_t, x):  # noqa
         return matmul(adj_t, x, reduce=self.aggr)
 
@@ -91,10 +109,15 @@ class NodeClassifier(torch.nn.Module):
                  x_steps:               dict(help='KProp step parameter for features', option='-kx') = 0,
                  y_steps:               dict(help='KProp step parameter for labels', option='-ky') = 0,
                  forward_correction:    dict(help='applies forward loss correction', option='--forward') = True,
+                 compile_model:         dict(help='compiles the backbone GNN with torch.compile',
+                                             option='--compile') = False,
+                 propagated_x=None,
                  ):
         super().__init__()
 
-        self.x_prop = KProp(steps=x_steps, aggregator='add', add_self_loops=False, normalize=True, cached=True)
+        # propagated_x: output of x_prop from an earlier model trained on the same features, reused instead of recomputed
+        self.x_prop = KProp(steps=x_steps, aggregator='add', add_self_loops=False, normalize=True, cached=True,
+                            cached_x=propagated_x)
         self.y_prop = KProp(steps=y_steps, aggregator='add', add_self_loops=False, normalize=True, cached=False,
                             transform=torch.nn.Softmax(dim=1))
 
@@ -105,9 +128,22 @@ class NodeClassifier(torch.nn.Module):
             dropout=dropout
         )
 
+        if compile_model:
+            if not hasattr(torch, 'compile'):
+                raise RuntimeError('compiling the model (--compile) requires PyTorch >= 2.0')
+
+            # shapes are fixed during training, so CUDA graphs can replay the captured parts of the forward pass;
+            # torch_sparse ops in the convolutions cause graph breaks and run eagerly in between
+            self.gnn = torch.compile(self.gnn, mode='reduce-overhead')
+
         self.cached_yt = None
         self.forward_correction = forward_correction
 
+    @property
+    def propagated_x(self):
+        # features propagated by x_prop, available after the first forward pass
+        return self.x_prop._cached_x
+
     def forward(self, data):
         x, adj_t = data.x, data.adj_t
         x = self.x_prop(x, adj_t)
@@ -127,11 +163,15 @@ class NodeClassifier(torch.nn.Module):
             yp[data.test_mask] = 0  # to avoid using test labels
             self.cached_yt = self.y_prop(yp, data.adj_t)  # y~
 
-        loss = self.cross_entropy_loss(p_y=p_yt_x[data.train_mask], y=self.cached_yt[data.train_mask], weighted=False)
+        train_idx = data.train_idx
+        loss = self.cross_entropy_loss(
+            p_y=p_yt_x.index_select(0, train_idx), y=self.cached_yt.index_select(0, train_idx), weighted=False
+        )
 
         metrics = {
             'train/loss': loss.item(),
-            'train/acc': self.accuracy(pred=p_y_x[data.train_mask], target=data.y[data.train_mask]) * 100,
+            'train/acc': self.accuracy(pred=p_y_x.index_select(0, train_idx),
+                                       target=data.y.index_select(0, train_idx)) * 100,
             'train/maxacc': data.T[0, 0].item() * 100,
         }
 
@@ -140,10 +180,14 @@ class NodeClassifier(torch.nn.Module):
     def validation_step(self, data):
         p_y_x, p_yp_x, p_yt_x = self(data)
 
+        val_idx, test_idx = data.val_idx, data.test_idx
+        y_val = data.y.index_select(0, val_idx)
+
         metrics = {
-            'val/loss': self.cross_entropy_loss(p_yp_x[data.val_mask], data.y[data.val_mask]).item(),
-            'val/acc': self.accuracy(pred=p_y_x[data.val_mask], target=data.y[data.val_mask]) * 100,
-            'test/acc': self.accuracy(pred=p_y_x[data.test_mask], target=data.y[data.test_mask]) * 100,
+            'val/loss': self.cross_entropy_loss(p_yp_x.index_select(0, val_idx), y_val).item(),
+            'val/acc': self.accuracy(pred=p_y_x.index_select(0, val_idx), target=y_val) * 100,
+            'test/acc': self.accuracy(pred=p_y_x.index_select(0, test_idx),
+                                      target=data.y.index_select(0, test_idx)) * 100,
         }
 
         return metrics
@@ -13,6 +13,10 @@ class FeatureTransform:
 
         self.feature = feature
 
+    @property
+    def deterministic(self):
+        return self.feature != 'rnd'
+
     def __call__(self, data):
 
         if self.feature == 'rnd':
@@ -37,6 +41,10 @@ class FeaturePerturbation:
         self.input_range = data_range
         self.x_eps = x_eps
 
+    @property
+    def deterministic(self):
+        return np.isinf(self.x_eps)
+
     def __call__(self, data):
         if np.isinf(self.x_eps):
             return data
@@ -84,7 +92,9 @@ class OneHotDegree:
     def __call__(self, data):
         degree = data.adj_t.sum(dim=0).long()
         degree.clamp_(max=self.max_degree)
-        data.x = F.one_hot(degree, num_classes=self.max_degree + 1).float()  # add 1 for zero degree
+        # scatter directly into a float matrix rather than densifying an int64 one-hot and casting it
+        data.x = torch.zeros(degree.size(0), self.max_degree + 1, device=degree.device)  # add 1 for zero degree
+        data.x.scatter_(1, degree.unsqueeze(1), 1.0)
         return data
 
 